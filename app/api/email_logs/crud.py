@@ -23,6 +23,9 @@ from app.core.logger import logger
 from app.core.mail import send_mail
 from app.core.utils import create_spice, current_time, encode
 
+# Pending email logs are written in batches of this size
+EMAIL_LOG_BATCH_SIZE = 50
+
 
 def _generate_authenticate_url(
     receiver_mail: str,
@@ -89,7 +92,13 @@ class CRUDEmailLog(
         citizen_id: Optional[int] = None,
         popup_slug: Optional[str] = None,
         attachments: Optional[List[EmailAttachment]] = None,
+        pending_logs: Optional[List[EmailLogCreate]] = None,
     ) -> dict:
+        """
+        Send an email and log the result.
+        If pending_logs is provided, the log entry is appended to it instead of
+        being inserted right away, so callers can flush it with create_logs.
+        """
         if send_at and not entity_type and not entity_id:
             raise ValueError(
                 'entity_type and entity_id are required if send_at is provided'
@@ -101,7 +110,6 @@ class CRUDEmailLog(
                 receiver_mail, spice, citizen_id, popup_slug
             )
 
-        db = SessionLocal()
         status = EmailStatus.FAILED
         error_message = None
         template = event
@@ -137,25 +145,85 @@ class CRUDEmailLog(
             error_message = str(e)
             raise
         finally:
-            try:
-                email_log_data = EmailLogCreate(
-                    receiver_email=receiver_mail,
-                    popup_city_id=popup_city.id if popup_city else None,
-                    template=template,
-                    event=event,
-                    params=params,
-                    status=status,
-                    send_at=send_at,
-                    error_message=error_message,
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                    attachments=attachments,
-                )
-                self.create(db, obj=email_log_data)
-            except Exception as db_error:
-                logger.error('Failed to log email: %s', str(db_error))
-            finally:
-                db.close()
+            email_log_data = EmailLogCreate(
+                receiver_email=receiver_mail,
+                popup_city_id=popup_city.id if popup_city else None,
+                template=template,
+                event=event,
+                params=params,
+                status=status,
+                send_at=send_at,
+                error_message=error_message,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                attachments=attachments,
+            )
+            if pending_logs is not None:
+                pending_logs.append(email_log_data)
+            else:
+                db = SessionLocal()
+                try:
+                    self.create(db, obj=email_log_data)
+                except Exception as db_error:
+                    logger.error('Failed to log email: %s', str(db_error))
+                finally:
+                    db.close()
+
+    def create_logs(
+        self,
+        db: Session,
+        logs: List[EmailLogCreate],
+        batch_size: int = EMAIL_LOG_BATCH_SIZE,
+    ) -> None:
+        """
+        Insert the pending email logs and empty the list.
+        Each batch is committed on its own, in a separate session so the caller's
+        loaded objects are not expired. If a batch fails, its logs are inserted
+        one by one, since the emails were already sent and must not be resent.
+        """
+        with Session(bind=db.get_bind()) as log_db:
+            while logs:
+                batch = logs[:batch_size]
+                del logs[:batch_size]
+                try:
+                    self._insert_logs(log_db, batch)
+                except Exception as db_error:
+                    log_db.rollback()
+                    logger.error(
+                        'Failed to log %s emails in batch, retrying one by one: %s',
+                        len(batch),
+                        str(db_error),
+                    )
+                    for log in batch:
+                        try:
+                            self.create(log_db, obj=log)
+                        except Exception as e:
+                            logger.error(
+                                'Failed to log email to %s: %s', log.receiver_email, e
+                            )
+                            log_db.rollback()
+
+    def _insert_logs(self, db: Session, logs: List[EmailLogCreate]) -> None:
+        from app.api.citizens.models import Citizen
+
+        model_columns = self.model.__table__.columns.keys()
+        rows = [
+            {k: v for k, v in log.model_dump().items() if k in model_columns}
+            for log in logs
+        ]
+
+        # bulk inserts skip the before_insert hook, so resolve citizens here
+        emails = {row['receiver_email'] for row in rows}
+        citizen_ids = dict(
+            db.query(Citizen.primary_email, Citizen.id)
+            .filter(Citizen.primary_email.in_(emails))
+            .all()
+        )
+        for row in rows:
+            row['citizen_id'] = citizen_ids.get(row['receiver_email'])
+
+        db.bulk_insert_mappings(self.model, rows)
+        db.commit()
 
     def send_login_mail(
         self,
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, event
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, event
 
-from app.core.database import Base, SessionLocal
+from app.core.database import ENSURE_INDEX, Base, SessionLocal
 from app.core.utils import current_time
 
 
@@ -32,6 +32,16 @@ class EmailLog(Base):
     created_by = Column(String)
     updated_by = Column(String)
 
+    __table_args__ = (
+        Index(
+            'ix_email_logs_event_receiver_created',
+            event,
+            receiver_email,
+            created_at.desc(),
+            info={ENSURE_INDEX: True},
+        ),
+    )
+
 
 @event.listens_for(EmailLog, 'before_insert')
 def set_citizen_id(mapper, connection, target):
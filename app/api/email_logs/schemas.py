@@ -56,6 +56,7 @@ class EmailAttachment(BaseModel):
 
     model_config = ConfigDict(
         populate_by_name=True,
+        frozen=True,
     )
 
 
@@ -73,6 +74,10 @@ class EmailLogBase(BaseModel):
     attachments: Optional[List[EmailAttachment]] = None
     created_at: Optional[datetime] = None
 
+    model_config = ConfigDict(
+        frozen=True,
+    )
+
     @field_serializer('params')
     def serialize_params(self, params: dict) -> str:
         return json.dumps(params, sort_keys=True)
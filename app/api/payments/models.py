@@ -1,9 +1,18 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import Mapped, relationship
 
-from app.core.database import Base
+from app.core.database import ENSURE_INDEX, Base
 from app.core.utils import current_time
 
 if TYPE_CHECKING:
@@ -70,3 +79,16 @@ class Payment(Base):
 
     created_at = Column(DateTime, default=current_time)
     updated_at = Column(DateTime, default=current_time, onupdate=current_time)
+
+    # Serves the abandoned cart LATERAL lookup of each application's latest payment
+    # (ORDER BY created_at DESC NULLS LAST, id DESC LIMIT 1); NULLS LAST is
+    # Postgres-only
+    __table_args__ = (
+        Index(
+            'ix_payments_application_latest',
+            application_id,
+            created_at.desc().nulls_last(),
+            id.desc(),
+            info={ENSURE_INDEX: True},
+        ).ddl_if(dialect='postgresql'),
+    )
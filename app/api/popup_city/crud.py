@@ -2,6 +2,7 @@ import urllib.parse
 from datetime import timedelta
 from typing import List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.api.applications.crud import application as application_crud
@@ -48,8 +49,7 @@ class CRUDPopUpCity(
             db.query(models.EmailTemplate)
             .join(models.PopUpCity)
             .filter(
-                models.EmailTemplate.frequency.isnot(None),
-                models.EmailTemplate.frequency != '',
+                func.coalesce(models.EmailTemplate.frequency, '') != '',
                 models.PopUpCity.end_date.isnot(None),
                 models.PopUpCity.end_date > week_from_now,
                 models.PopUpCity.visible_in_portal,
@@ -79,17 +79,16 @@ class CRUDPopUpCity(
         ticketing_url = urllib.parse.urljoin(
             settings.FRONTEND_URL, f'/portal/{popup.slug}/passes'
         )
+        base_params = {'ticketing_url': ticketing_url}
+        event = EmailEvent.INCREASE_REMINDER
         for application in results:
             logger.info('Sending increase reminder email to %s', application.email)
             try:
                 email_log_crud.send_mail(
                     receiver_mail=application.email,
-                    event=EmailEvent.INCREASE_REMINDER,
+                    event=event,
                     popup_city=popup,
-                    params={
-                        'first_name': application.first_name,
-                        'ticketing_url': ticketing_url,
-                    },
+                    params={**base_params, 'first_name': application.first_name},
                     entity_type='application',
                     entity_id=application.id,
                 )
@@ -1,10 +1,20 @@
 from typing import List
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import Mapped, relationship
 
 from app.api.email_logs.schemas import EmailEvent
-from app.core.database import Base
+from app.core.database import ENSURE_INDEX, Base
 from app.core.utils import current_time
 
 
@@ -23,6 +33,15 @@ class EmailTemplate(Base):
         'PopUpCity', back_populates='templates'
     )
 
+    __table_args__ = (
+        Index(
+            'ix_popup_email_templates_reminder',
+            popup_city_id,
+            postgresql_where=(func.coalesce(frequency, '') != ''),
+            info={ENSURE_INDEX: True},
+        ),
+    )
+
 
 class PopUpCity(Base):
     __tablename__ = 'popups'
@@ -70,6 +89,16 @@ class PopUpCity(Base):
     created_by = Column(String)
     updated_by = Column(String)
 
+    __table_args__ = (
+        Index(
+            'ix_popups_portal_end_date',
+            visible_in_portal,
+            end_date,
+            postgresql_where=visible_in_portal,
+            info={ENSURE_INDEX: True},
+        ),
+    )
+
     def get_email_template(self, event: EmailEvent) -> str:
         for t in self.templates:
             if t.event == event:
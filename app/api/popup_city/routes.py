@@ -1,16 +1,35 @@
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
-from app.api.popup_city import schemas
+from app.api.popup_city import models, schemas
 from app.api.popup_city.crud import popup_city as popup_city_crud
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import TokenData, get_current_user
 
-router = APIRouter(prefix='/popups', tags=['Popups'])
+router = APIRouter(
+    prefix='/popups',
+    tags=['Popups'],
+    default_response_class=ORJSONResponse,
+)
 
 
-@router.get('', response_model=list[schemas.PopUpCity])
+def _to_schema(db_popup_city: models.PopUpCity) -> schemas.PopUpCity:
+    # Rows come straight from the database, so skip pydantic validation
+    return schemas.PopUpCity.model_construct(
+        **{
+            field: getattr(db_popup_city, field)
+            for field in schemas.PopUpCity.model_fields
+        }
+    )
+
+
+@router.get(
+    '',
+    response_model=None,
+    responses={200: {'model': list[schemas.PopUpCity]}},
+)
 def get_popup_cities(
     current_user: TokenData = Depends(get_current_user),
     skip: int = 0,
@@ -19,13 +38,20 @@ def get_popup_cities(
     sort_order: str = Query(default='asc', pattern='^(asc|desc)$'),
     db: Session = Depends(get_db),
 ):
-    return popup_city_crud.find(
+    popup_cities = popup_city_crud.find(
         db=db,
         skip=skip,
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
     )
+    # Serialize here so FastAPI does not walk the models with jsonable_encoder
+    return ORJSONResponse(
+        content=[
+            _to_schema(popup_city).model_dump(mode='json')
+            for popup_city in popup_cities
+        ]
+    )
 
 
 @router.get('/{popup_city_id}', response_model=schemas.PopUpCity)
@@ -23,6 +23,14 @@ from app.core.utils import current_time
 
 router = APIRouter(prefix='/webhooks', tags=['Webhooks'])
 
+APPROVED_EVENTS = frozenset(
+    {
+        EmailEvent.APPLICATION_APPROVED.value,
+        EmailEvent.APPLICATION_APPROVED_SCHOLARSHIP.value,
+        EmailEvent.APPLICATION_APPROVED_NON_SCHOLARSHIP.value,
+    }
+)
+
 
 @router.post('/update_status', status_code=status.HTTP_200_OK)
 async def update_status_webhook(
@@ -137,6 +145,7 @@ async def send_email_webhook(
     logger.info('Sending email %s to %s rows', event, len(webhook_payload.data.rows))
     logger.info('Fields: %s', fields)
     send_at = current_time() + timedelta(minutes=delay) if delay else None
+    is_approved_event = event in APPROVED_EVENTS
 
     for row in webhook_payload.data.rows:
         row = row.model_dump()
@@ -188,11 +197,6 @@ async def send_email_webhook(
 
         processed_ids.append(row['id'])
 
-        is_approved_event = event in [
-            EmailEvent.APPLICATION_APPROVED.value,
-            EmailEvent.APPLICATION_APPROVED_SCHOLARSHIP.value,
-            EmailEvent.APPLICATION_APPROVED_NON_SCHOLARSHIP.value,
-        ]
         is_patagonia = application.popup_city.slug == 'edge-patagonia'
 
         if is_approved_event and is_patagonia and application.brings_kids:
@@ -9,6 +9,9 @@ from app.core.config import settings
 from app.core.logger import logger
 from app.core.security import TokenData
 
+# Shared session so repeated RPC calls reuse the same keep-alive connection
+RPC_SESSION = requests.Session()
+
 
 class CRUDWorldBuilder(
     CRUDBase[
@@ -35,7 +38,7 @@ class CRUDWorldBuilder(
         headers = {'Content-Type': 'application/json'}
 
         rpc_url = settings.WORLD_CHAIN_URL
-        response = requests.post(rpc_url, headers=headers, json=payload)
+        response = RPC_SESSION.post(rpc_url, headers=headers, json=payload, timeout=10)
 
         if not response.ok:
             raise Exception(f'Error getting transaction count {response.text}')
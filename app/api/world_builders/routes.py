@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.world_builders import schemas
@@ -6,10 +7,18 @@ from app.api.world_builders.crud import world_builder as world_builder_crud
 from app.core.config import settings
 from app.core.database import get_db
 
-router = APIRouter(prefix='/world-builders', tags=['World Builders'])
+router = APIRouter(
+    prefix='/world-builders',
+    tags=['World Builders'],
+    default_response_class=ORJSONResponse,
+)
 
 
-@router.post('', response_model=schemas.WorldBuilder)
+@router.post(
+    '',
+    response_model=schemas.WorldBuilder,
+    response_model_exclude_none=True,
+)
 def create_world_builder(
     world_builder: schemas.WorldBuilderCreate,
     x_api_key: str = Header(...),
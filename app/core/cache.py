@@ -7,34 +7,30 @@ from app.core.utils import current_time
 
 class WebhookCache:
     def __init__(self, expiry: timedelta = timedelta(hours=24)):
-        self._cache: Dict[str, Tuple[datetime, str]] = {}
+        # Keyed by hash(fingerprint): the cache is process-local and short-lived,
+        # so the fingerprint strings themselves don't need to be kept around
+        self._cache: Dict[int, datetime] = {}
         self._expiry = expiry
         self._lock = Lock()
 
-    def exists(self, fingerprint: str) -> bool:
-        """Check if fingerprint exists and is not expired in a thread-safe manner"""
-        with self._lock:
-            self._clean_expired()
-            return fingerprint in self._cache
-
     def add(self, fingerprint: str) -> bool:
         """
-        Add fingerprint to cache if it doesn't exist.
+        Atomically check and add fingerprint to cache under a single lock.
         Returns True if fingerprint was added, False if it already existed.
         """
+        key = hash(fingerprint)
         with self._lock:
-            self._clean_expired()
-            if fingerprint in self._cache:
+            now = current_time()
+            self._clean_expired(now)
+            if key in self._cache:
                 return False
-            self._cache[fingerprint] = current_time()
+            self._cache[key] = now
             return True
 
-    def _clean_expired(self) -> None:
+    def _clean_expired(self, now: datetime) -> None:
         """Remove expired fingerprints - already protected by lock in public methods"""
         expired = [
-            k
-            for k, timestamp in self._cache.items()
-            if current_time() - timestamp > self._expiry
+            k for k, timestamp in self._cache.items() if now - timestamp > self._expiry
         ]
         for key in expired:
             del self._cache[key]
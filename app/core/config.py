@@ -26,6 +26,8 @@ class Settings:
         if ENVIRONMENT != Environment.TEST
         else SQLALCHEMY_TEST_DATABASE_URL
     )
+    # Dev-only: fail on any lazy load that hits the database (N+1 detection)
+    RAISE_ON_LAZY_LOAD: bool = os.getenv('RAISE_ON_LAZY_LOAD', '').lower() == 'true'
 
     POSTMARK_API_TOKEN: str = os.getenv('POSTMARK_API_TOKEN')
     EMAIL_FROM_ADDRESS: str = os.getenv('EMAIL_FROM_ADDRESS')
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy_utils import create_database, database_exists
 
@@ -7,6 +7,9 @@ from .logger import logger
 
 Base = declarative_base()
 
+# Index.info key for indexes that create_db adds to already existing tables
+ENSURE_INDEX = 'ensure_exists'
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_size=10,
@@ -20,6 +23,22 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def raise_on_lazy_load(orm_execute_state):
+    """Turn every lazy load that reaches the database into an error, so loops
+    that walk relationships row by row (N+1 queries) show up while
+    developing instead of silently slowing down production."""
+    state = orm_execute_state.lazy_loaded_from
+    if state is not None:
+        raise RuntimeError(
+            f'Lazy load on {state.class_.__name__} (id={state.identity}); '
+            'add selectinload/joinedload to the query'
+        )
+
+
+if settings.RAISE_ON_LAZY_LOAD:
+    event.listen(SessionLocal, 'do_orm_execute', raise_on_lazy_load)
+
+
 # Create the database tables
 def create_db():
     engine = create_engine(settings.DATABASE_URL)
@@ -29,6 +48,27 @@ def create_db():
         logger.info('Database created successfully!')
 
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes(engine)
+
+
+def create_missing_indexes(engine):
+    """
+    Create the indexes marked with info={ENSURE_INDEX: True}.
+    create_all skips tables that already exist, so indexes added to an existing
+    table would otherwise never reach deployed databases.
+    """
+    if engine.dialect.name != 'postgresql':
+        return
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if not index.info.get(ENSURE_INDEX):
+                continue
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # Another worker may be creating the same index at startup
+                logger.error('Failed to create index %s: %s', index.name, str(e))
 
 
 # Dependency for getting the database session
@@ -1,6 +1,7 @@
 import os
+from functools import lru_cache
 from io import BytesIO
-from typing import List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set
 from uuid import uuid4
 
 # from cairosvg import svg2png
@@ -10,14 +11,33 @@ from PIL import Image, ImageDraw, ImageFont
 from app.core.logger import logger
 
 
+@lru_cache(maxsize=64)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font once per (path, size) and reuse it across images."""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=8)
+def _load_background(path: str) -> Image.Image:
+    """Decode a background once; callers must copy it before drawing."""
+    with Image.open(path) as background:
+        return background.convert('RGB')
+
+
+@lru_cache(maxsize=1)
+def _load_default_font() -> ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
 def add_text_to_image(
-    image_path, villages_count, days_count, events_count, output_path
-):
+    image: Image.Image, villages_count, days_count, events_count
+) -> Image.Image:
     """
     Adds metrics overlay to the input image, styled like the example.
+    Returns the new image, leaving the input untouched.
     """
-    # Open the image
-    img = Image.open(image_path).convert('RGBA')
+    # The text is opaque, so draw on an RGB copy rather than an RGBA one
+    img = image.convert('RGB')
     img_width, img_height = img.size
     draw = ImageDraw.Draw(img)
 
@@ -30,16 +50,16 @@ def add_text_to_image(
     font_size_label = int(30 * scale_factor)
 
     try:
-        font_number = ImageFont.truetype(
+        font_number = _load_font(
             'static/fonts/PPRightGroteskMono-Regular.otf', font_size_number
         )
-        font_label = ImageFont.truetype(
+        font_label = _load_font(
             'static/fonts/PPRightGroteskMono-Regular.otf', font_size_label
         )
     except IOError:
         logger.warning('PP Right Grotesk Mono fonts not found')
-        font_number = ImageFont.load_default()
-        font_label = ImageFont.load_default()
+        font_number = _load_default_font()
+        font_label = _load_default_font()
 
     text_color = (0, 0, 0)  # Black text
     # Space between number and label block
@@ -131,23 +151,22 @@ def add_text_to_image(
     # except Exception as e:
     #     logger.warning('Could not add logo: %s', e)
 
-    # --- Save ---
-    img = img.convert('RGB')  # Convert back to RGB
-    # Save as PNG with high quality to avoid compression artifacts
-    img.save(output_path, format='PNG', optimize=False)
-    logger.info('Image with text saved as %s', output_path)
+    return img
 
 
-def create_framed_image(center_image_path, background_path, popups, output_path):
+def create_framed_image(
+    center_image: Image.Image, background_path, popups, output_path
+):
     """
     Frames the center image with background and adds text at bottom
     """
-    # Open the center image and convert to RGB
-    center_img = Image.open(center_image_path).convert('RGB')
+    center_img = center_image
+    if center_img.mode != 'RGB':
+        center_img = center_img.convert('RGB')
     center_width, center_height = center_img.size
 
-    # Open the background/frame and use its dimensions
-    background = Image.open(background_path).convert('RGB')
+    # Copy the cached background/frame and use its dimensions
+    background = _load_background(background_path).copy()
     canvas_width, canvas_height = background.size
 
     # Calculate scaling to fit the center image on background with padding
@@ -162,7 +181,11 @@ def create_framed_image(center_image_path, background_path, popups, output_path)
     new_width = int(center_width * scale)
     new_height = int(center_height * scale)
 
-    center_img_resized = center_img.resize((new_width, new_height))
+    # The AI images are ~3x larger than the slot, so let Pillow reduce by an
+    # integer factor first and resample only the remainder with LANCZOS
+    center_img_resized = center_img.resize(
+        (new_width, new_height), Image.LANCZOS, reducing_gap=3.0
+    )
 
     # Add 1px black frame to the resized center image
     frame_draw = ImageDraw.Draw(center_img_resized)
@@ -188,127 +211,66 @@ def create_framed_image(center_image_path, background_path, popups, output_path)
     corner_color = (0, 0, 0)
     corner_width = 2
 
-    # Top-left corner
-    draw.line(
-        (
-            x - corner_offset,
-            y - corner_offset,
-            x - corner_offset + corner_length,
-            y - corner_offset,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-    draw.line(
-        (
-            x - corner_offset,
-            y - corner_offset,
-            x - corner_offset,
-            y - corner_offset + corner_length,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-
-    # Top-right corner
-    draw.line(
-        (
-            x + new_width + corner_offset,
-            y - corner_offset,
-            x + new_width + corner_offset - corner_length,
-            y - corner_offset,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-    draw.line(
-        (
-            x + new_width + corner_offset,
-            y - corner_offset,
-            x + new_width + corner_offset,
-            y - corner_offset + corner_length,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-
-    # Bottom-left corner
-    draw.line(
-        (
-            x - corner_offset,
-            y + new_height + corner_offset,
-            x - corner_offset + corner_length,
-            y + new_height + corner_offset,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-    draw.line(
-        (
-            x - corner_offset,
-            y + new_height + corner_offset,
-            x - corner_offset,
-            y + new_height + corner_offset - corner_length,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-
-    # Bottom-right corner
-    draw.line(
-        (
-            x + new_width + corner_offset,
-            y + new_height + corner_offset,
-            x + new_width + corner_offset - corner_length,
-            y + new_height + corner_offset,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
-    draw.line(
-        (
-            x + new_width + corner_offset,
-            y + new_height + corner_offset,
-            x + new_width + corner_offset,
-            y + new_height + corner_offset - corner_length,
-        ),
-        fill=corner_color,
-        width=corner_width,
-    )
+    left = x - corner_offset
+    right = x + new_width + corner_offset
+    top = y - corner_offset
+    bottom = y + new_height + corner_offset
+    corners = [
+        # Top-left corner
+        [(left + corner_length, top), (left, top), (left, top + corner_length)],
+        # Top-right corner
+        [(right - corner_length, top), (right, top), (right, top + corner_length)],
+        # Bottom-left corner
+        [
+            (left + corner_length, bottom),
+            (left, bottom),
+            (left, bottom - corner_length),
+        ],
+        # Bottom-right corner
+        [
+            (right - corner_length, bottom),
+            (right, bottom),
+            (right, bottom - corner_length),
+        ],
+    ]
+    for points in corners:
+        draw.line(points, fill=corner_color, width=corner_width, joint='curve')
 
-    # Add text at the bottom
-    draw = ImageDraw.Draw(background)
+    # Add text at the bottom, reusing the same draw context
 
     # Load fonts
     try:
         # Main title font - PP Editorial Old Italic
-        title_font = ImageFont.truetype('static/fonts/PPEditorialOld-Italic.otf', 100)
+        title_font = _load_font('static/fonts/PPEditorialOld-Italic.otf', 100)
         # Subtitle font - PP Right Grotesk Mono Regular Italic
-        subtitle_font = ImageFont.truetype(
+        subtitle_font = _load_font(
             'static/fonts/PPRightGroteskMono-RegularItalic.otf', 29
         )
         # Villages font - PP Right Grotesk Mono Medium
-        villages_font = ImageFont.truetype(
-            'static/fonts/PPRightGroteskMono-Medium.otf', 40
-        )
+        villages_font = _load_font('static/fonts/PPRightGroteskMono-Medium.otf', 40)
     except IOError:
         logger.warning('Required fonts not found, trying alternatives...')
         try:
             # Fallback to regular italic if specific italic version not found
-            title_font = ImageFont.truetype(
-                'static/fonts/PPEditorialOld-Italic.otf', 100
-            )
-            subtitle_font = ImageFont.truetype(
+            title_font = _load_font('static/fonts/PPEditorialOld-Italic.otf', 100)
+            subtitle_font = _load_font(
                 'static/fonts/PPRightGroteskMono-Regular.otf', 29
             )
-            villages_font = ImageFont.truetype(
-                'static/fonts/PPRightGroteskMono-Medium.otf', 40
-            )
+            villages_font = _load_font('static/fonts/PPRightGroteskMono-Medium.otf', 40)
         except IOError:
             logger.warning('Fonts not found, using defaults.')
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            villages_font = ImageFont.load_default()
+            title_font = _load_default_font()
+            subtitle_font = _load_default_font()
+            villages_font = _load_default_font()
+
+    # The first villages line is measured for its height and again when drawn
+    bbox_cache = {}
+
+    def text_bbox(text, font):
+        key = (id(font), text)
+        if key not in bbox_cache:
+            bbox_cache[key] = draw.textbbox((0, 0), text, font=font)
+        return bbox_cache[key]
 
     title_color = (0, 0, 0)  # Black for title and villages
     subtitle_color = (84, 84, 84)  # #545454 for subtitle
@@ -320,7 +282,7 @@ def create_framed_image(center_image_path, background_path, popups, output_path)
     villages_text = ', '.join(popups)
 
     # Check if villages text fits in one line
-    bbox_villages_test = draw.textbbox((0, 0), villages_text, font=villages_font)
+    bbox_villages_test = text_bbox(villages_text, villages_font)
     villages_width_test = bbox_villages_test[2] - bbox_villages_test[0]
 
     # Wrap villages if they don't fit (with some padding)
@@ -328,33 +290,36 @@ def create_framed_image(center_image_path, background_path, popups, output_path)
     villages_lines = []
 
     if villages_width_test > available_text_width:
-        # Split into multiple lines
+        # Split into multiple lines, measuring each village only once
         words = villages_text.split(', ')
+        separator_width = villages_font.getlength(', ')
         current_line = words[0]
+        current_width = villages_font.getlength(current_line)
 
         for word in words[1:]:
-            test_line = current_line + ', ' + word
-            bbox_test = draw.textbbox((0, 0), test_line, font=villages_font)
-            test_width = bbox_test[2] - bbox_test[0]
+            word_width = villages_font.getlength(word)
+            test_width = current_width + separator_width + word_width
 
             if test_width <= available_text_width:
-                current_line = test_line
+                current_line = current_line + ', ' + word
+                current_width = test_width
             else:
                 villages_lines.append(current_line)
                 current_line = word
+                current_width = word_width
 
         villages_lines.append(current_line)
     else:
         villages_lines = [villages_text]
 
     # Calculate dimensions
-    bbox_title = draw.textbbox((0, 0), title_text, font=title_font)
+    bbox_title = text_bbox(title_text, title_font)
     title_height = bbox_title[3] - bbox_title[1]
 
-    bbox_subtitle = draw.textbbox((0, 0), subtitle_text, font=subtitle_font)
+    bbox_subtitle = text_bbox(subtitle_text, subtitle_font)
     subtitle_height = bbox_subtitle[3] - bbox_subtitle[1]
 
-    bbox_villages_single = draw.textbbox((0, 0), villages_lines[0], font=villages_font)
+    bbox_villages_single = text_bbox(villages_lines[0], villages_font)
     villages_line_height = bbox_villages_single[3] - bbox_villages_single[1]
 
     line_spacing = 5
@@ -391,15 +356,16 @@ def create_framed_image(center_image_path, background_path, popups, output_path)
     # Draw villages lines
     current_y = subtitle_y + subtitle_height + text_spacing
     for line in villages_lines:
-        bbox_line = draw.textbbox((0, 0), line, font=villages_font)
+        bbox_line = text_bbox(line, villages_font)
         line_width = bbox_line[2] - bbox_line[0]
         line_x = (canvas_width - line_width) // 2
         draw.text((line_x, current_y), line, font=villages_font, fill=title_color)
         current_y += villages_line_height + line_spacing
 
-    # Save the result as PNG to avoid JPEG compression artifacts
+    # Save the result as PNG to avoid JPEG compression artifacts. A lower zlib
+    # level encodes much faster for a slightly larger file
     output_path_png = output_path.replace('.jpeg', '.png').replace('.jpg', '.png')
-    background.save(output_path_png, format='PNG')
+    background.save(output_path_png, format='PNG', compress_level=3)
     logger.info('Framed image saved as %s', output_path_png)
 
 
@@ -410,9 +376,8 @@ def _generate_edge_mapped(
     events_count: int,
     popups: List[str],
     background_path='static/images/background.png',
-    intermediate_output: Optional[str] = None,
     final_output: Optional[str] = None,
-):
+) -> str:
     """
     Main function to generate both Edge Mapped images
 
@@ -425,41 +390,45 @@ def _generate_edge_mapped(
         background_path: Path to the background image (default: "background.png")
 
     Returns:
-        tuple: (intermediate_image_path, final_image_path)
+        str: Path to the final image
     """
-    image_id = str(uuid4())
-    if not intermediate_output:
-        intermediate_output = f'/tmp/{image_id}_intermediate.png'
     if not final_output:
-        final_output = f'/tmp/{image_id}_final.png'
+        final_output = f'/tmp/{uuid4()}_final.png'
 
-    # Step 1: Create image with metrics overlay
+    # Step 1: Create image with metrics overlay, kept in memory
     logger.info('Step 1: Adding metrics overlay to image...')
-    add_text_to_image(
-        ai_image_path, villages_count, days_count, events_count, intermediate_output
-    )
+    with Image.open(ai_image_path) as ai_image:
+        intermediate_img = add_text_to_image(
+            ai_image, villages_count, days_count, events_count
+        )
 
     # Step 2: Create framed final image
     logger.info('Step 2: Creating framed final image...')
-    create_framed_image(intermediate_output, background_path, popups, final_output)
+    create_framed_image(intermediate_img, background_path, popups, final_output)
 
     logger.info('Generation complete!')
-    logger.info('   - Intermediate image: %s', intermediate_output)
     logger.info('   - Final image: %s', final_output)
 
-    return intermediate_output, final_output
+    return final_output
 
 
-def _get_ai_image(codes: Set[str]) -> str:
-    directory = 'static/images'
-    with os.scandir(directory) as entries:
+@lru_cache(maxsize=1)
+def _ai_image_index() -> Dict[FrozenSet[str], str]:
+    """Map each AI image's set of popup codes to its path, scanned once."""
+    index = {}
+    with os.scandir('static/images') as entries:
         for entry in entries:
             if entry.is_file():
-                filename = entry.name.split('.')[0]
-                if codes == set(filename.split('-')):
-                    return entry.path
+                stem, _ = os.path.splitext(entry.name)
+                index.setdefault(frozenset(stem.split('-')), entry.path)
+    return index
 
-    raise ValueError(f'No image found for codes: {codes}')
+
+def _get_ai_image(codes: Set[str]) -> str:
+    try:
+        return _ai_image_index()[frozenset(codes)]
+    except KeyError:
+        raise ValueError(f'No image found for codes: {codes}')
 
 
 def generate_edge_mapped(
@@ -478,15 +447,15 @@ def generate_edge_mapped(
         ('Patagonia', 'AR'),
     ]
 
+    lowered_popups = [popup.lower() for popup in popups]
     locations = []
     codes = set()
     for name, code in popups_map:
-        for popup in popups:
-            if name.lower() in popup.lower():
-                if name not in locations:
-                    locations.append(name)
-                codes.add(code)
-                break
+        lowered_name = name.lower()
+        if any(lowered_name in popup for popup in lowered_popups):
+            if name not in locations:
+                locations.append(name)
+            codes.add(code)
 
     if not codes or not locations:
         raise HTTPException(
@@ -503,12 +472,10 @@ def generate_edge_mapped(
     if 'Bhutan' in locations:
         events_count += 10
 
-    intermediate_output, final_output = _generate_edge_mapped(
+    return _generate_edge_mapped(
         ai_image_path,
         villages_count,
         days_count,
         events_count,
         locations,
     )
-    os.remove(intermediate_output)
-    return final_output
@@ -4,6 +4,12 @@ from app.api.email_logs.schemas import EmailAttachment, EmailStatus
 from app.core.config import Environment, settings
 from app.core.logger import logger
 
+POSTMARK_URL = 'https://api.postmarkapp.com/email/withTemplate'
+
+# Shared session so consecutive emails reuse the keep-alive connection to
+# Postmark instead of a new TCP/TLS handshake per email
+POSTMARK_SESSION = requests.Session()
+
 
 def send_mail(
     receiver_mail: str,
@@ -13,7 +19,6 @@ def send_mail(
     attachments: list[EmailAttachment] = None,
 ):
     logger.info('sending %s email to %s', template, receiver_mail)
-    url = 'https://api.postmarkapp.com/email/withTemplate'
     headers = {
         'Accept': 'application/json',
         'Content-Type': 'application/json',
@@ -34,7 +39,9 @@ def send_mail(
     if settings.ENVIRONMENT == Environment.TEST:
         return {'status': EmailStatus.SUCCESS}
 
-    response = requests.post(url, json=data, headers=headers)
+    response = POSTMARK_SESSION.post(
+        POSTMARK_URL, json=data, headers=headers, timeout=30
+    )
     response.raise_for_status()
 
     return {'status': EmailStatus.SUCCESS, 'response': response.json()}
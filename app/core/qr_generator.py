@@ -1,16 +1,90 @@
 import base64
 import json
 import os
+from functools import lru_cache
 from io import BytesIO
 
 import font_roboto
-import qrcode
+import segno
 from PIL import Image, ImageDraw, ImageFont
 
+# Bundled Roboto font package, so fonts are consistent across environments
+FONT_DIR = os.path.join(os.path.dirname(font_roboto.__file__), 'files')
 
+
+def _draw_text_with_shadow(img, xy, text, font, bbox, shadow_color, offset=2):
+    """
+    Draw white text over a colored copy shifted by offset pixels.
+
+    The glyphs are rasterized once into a mask, which is then pasted for
+    both the shadow and the text, instead of rendering the text twice.
+
+    Args:
+        img: The image to draw on
+        xy: Top-left anchor of the text, as passed to ImageDraw.text
+        text: The text to draw
+        font: The font to render with
+        bbox: The text's bounding box when drawn at (0, 0)
+        shadow_color: Fill color of the shadow
+        offset: Shadow offset in pixels, both right and down
+    """
+    left, top, right, bottom = bbox
+    mask = Image.new('L', (right - left, bottom - top))
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    x, y = xy[0] + left, xy[1] + top
+    img.paste(shadow_color, (x + offset, y + offset), mask)
+    img.paste(TEXT_COLOR, (x, y), mask)
+
+
+def _hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple."""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+
+
+def _blend(fg_color, bg_color, alpha):
+    """Blend a hex color with the given alpha over an opaque hex background."""
+    return tuple(
+        round(fg * alpha / 255 + bg * (255 - alpha) / 255)
+        for fg, bg in zip(_hex_to_rgb(fg_color), _hex_to_rgb(bg_color))
+    )
+
+
+# Edge City Patagonia color palette
+PRIMARY_COLOR = '#4d65ff'  # Bright blue (from edgecity.live)
+SECONDARY_COLOR = '#286C71'  # Teal/dark cyan
+ACCENT_COLOR = '#cde1da'  # Light sage green
+BACKGROUND_COLOR = '#0F0F3E'  # Dark navy background
+TEXT_COLOR = '#FFFFFF'  # White text
+QR_BACKGROUND = '#FFFFFF'  # White QR code background
+CARD_BACKGROUND = '#1a1a4a'  # Slightly lighter navy for depth
+
+# Translucent decorative circles, pre-blended over the background
+CIRCLE_ALPHA = 40
+PRIMARY_CIRCLE_RGB = _blend(PRIMARY_COLOR, BACKGROUND_COLOR, CIRCLE_ALPHA)
+SECONDARY_CIRCLE_RGB = _blend(SECONDARY_COLOR, BACKGROUND_COLOR, CIRCLE_ALPHA)
+ACCENT_CIRCLE_RGB = _blend(ACCENT_COLOR, BACKGROUND_COLOR, CIRCLE_ALPHA)
+
+
+@lru_cache(maxsize=64)
+def _load_font(name: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a bundled font once per (name, size) and reuse it across images."""
+    return ImageFont.truetype(os.path.join(FONT_DIR, name), size)
+
+
+@lru_cache(maxsize=64)
+def _load_default_font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
 def generate_qr_code_base64(code: str, name: str) -> str:
     """
     Generate a modern, styled QR code image and return it as a base64-encoded PNG.
+    The output only depends on its arguments, so recent results are cached.
 
     Args:
         code: The attendee code (e.g., "EP25NJAH")
@@ -19,15 +93,6 @@ def generate_qr_code_base64(code: str, name: str) -> str:
     Returns:
         Base64-encoded PNG image string
     """
-    # Edge City Patagonia color palette
-    PRIMARY_COLOR = '#4d65ff'  # Bright blue (from edgecity.live)
-    SECONDARY_COLOR = '#286C71'  # Teal/dark cyan
-    ACCENT_COLOR = '#cde1da'  # Light sage green
-    BACKGROUND_COLOR = '#0F0F3E'  # Dark navy background
-    TEXT_COLOR = '#FFFFFF'  # White text
-    QR_BACKGROUND = '#FFFFFF'  # White QR code background
-    CARD_BACKGROUND = '#1a1a4a'  # Slightly lighter navy for depth
-
     # Design constants
     PADDING = 60  # Generous padding
     CARD_PADDING = 30  # Padding inside the card
@@ -35,43 +100,24 @@ def generate_qr_code_base64(code: str, name: str) -> str:
     TEXT_MARGIN = 40  # Space between QR code and text
     LINE_SPACING = 10  # Space between wrapped text lines
 
-    # Load fonts from the bundled Roboto font package
-    # This ensures consistent fonts across all environments (dev, server, etc.)
-    font_dir = os.path.join(os.path.dirname(font_roboto.__file__), 'files')
-
     try:
-        font_name = ImageFont.truetype(os.path.join(font_dir, 'Roboto-Bold.ttf'), 36)
-        font_large = ImageFont.truetype(os.path.join(font_dir, 'Roboto-Bold.ttf'), 48)
-        font_small = ImageFont.truetype(
-            os.path.join(font_dir, 'Roboto-Regular.ttf'), 20
-        )
+        font_name = _load_font('Roboto-Bold.ttf', 36)
+        font_large = _load_font('Roboto-Bold.ttf', 48)
+        font_small = _load_font('Roboto-Regular.ttf', 20)
     except (OSError, IOError):
         # Fallback to default font if something goes wrong
-        try:
-            font_name = ImageFont.load_default(size=36)
-            font_large = ImageFont.load_default(size=48)
-            font_small = ImageFont.load_default(size=20)
-        except TypeError:
-            font_name = ImageFont.load_default()
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_name = _load_default_font(36)
+        font_large = _load_default_font(48)
+        font_small = _load_default_font(20)
 
     # Create the JSON content for the QR code
     qr_content = json.dumps({'code': code})
 
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=2,
-    )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
+    # Generate QR code, smallest version that fits
+    qr = segno.make_qr(qr_content, error='h')
 
     # Create the QR code image
-    qr_img = qr.make_image(fill_color='black', back_color='white')
-    qr_img = qr_img.convert('RGB')
+    qr_img = _render_qr(qr, box_size=10, border=2).convert('RGB')
     qr_width, qr_height = qr_img.size
 
     # Calculate dimensions
@@ -81,14 +127,23 @@ def generate_qr_code_base64(code: str, name: str) -> str:
     temp_img = Image.new('RGB', (1, 1))
     temp_draw = ImageDraw.Draw(temp_img)
 
+    # Measure each (font, text) pair once
+    bbox_cache = {}
+
+    def text_bbox(text, font):
+        key = (id(font), text)
+        if key not in bbox_cache:
+            bbox_cache[key] = temp_draw.textbbox((0, 0), text, font=font)
+        return bbox_cache[key]
+
     # Calculate max width for name (card width minus padding on both sides)
     max_name_width = card_width - (CARD_PADDING * 2)
 
     # Wrap the name text if needed
-    name_lines = _wrap_text(name, font_name, max_name_width, temp_draw)
+    name_lines = _wrap_text(name, font_name, max_name_width)
 
     # Calculate name section height based on number of lines
-    name_bbox = temp_draw.textbbox((0, 0), 'Ay', font=font_name)  # Measure line height
+    name_bbox = text_bbox('Ay', font_name)  # Measure line height
     line_height = name_bbox[3] - name_bbox[1]
     NAME_SECTION_HEIGHT = (
         CARD_PADDING
@@ -109,37 +164,31 @@ def generate_qr_code_base64(code: str, name: str) -> str:
 
     # Draw decorative circles in corners
     circle_radius = 120
-    circle_alpha = 40
 
+    # Circles are translucent over a flat background, so their colors are
+    # pre-blended and drawn directly instead of compositing an RGBA overlay
     # Top-left decorative circle (primary color)
-    circle_overlay = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-    circle_draw = ImageDraw.Draw(circle_overlay)
-    circle_draw.ellipse(
+    draw.ellipse(
         [(-60, -60), (circle_radius, circle_radius)],
-        fill=(*_hex_to_rgb(PRIMARY_COLOR), circle_alpha),
+        fill=PRIMARY_CIRCLE_RGB,
     )
     # Bottom-right decorative circle (secondary color)
-    circle_draw.ellipse(
+    draw.ellipse(
         [
             (canvas_width - circle_radius + 60, canvas_height - circle_radius + 60),
             (canvas_width + 60, canvas_height + 60),
         ],
-        fill=(*_hex_to_rgb(SECONDARY_COLOR), circle_alpha),
+        fill=SECONDARY_CIRCLE_RGB,
     )
     # Top-right decorative circle (accent color)
-    circle_draw.ellipse(
+    draw.ellipse(
         [
             (canvas_width - circle_radius + 40, -40),
             (canvas_width + 80, circle_radius),
         ],
-        fill=(*_hex_to_rgb(ACCENT_COLOR), circle_alpha),
+        fill=ACCENT_CIRCLE_RGB,
     )
 
-    final_img = Image.alpha_composite(
-        final_img.convert('RGBA'), circle_overlay
-    ).convert('RGB')
-    draw = ImageDraw.Draw(final_img)
-
     # Draw the main card with gradient-like effect
     card_x = PADDING
     card_y = PADDING
@@ -167,13 +216,14 @@ def generate_qr_code_base64(code: str, name: str) -> str:
     # Draw the attendee name at the top (multi-line support)
     name_y = card_y + CARD_PADDING
     for line in name_lines:
-        line_bbox = draw.textbbox((0, 0), line, font=font_name)
+        line_bbox = text_bbox(line, font_name)
         line_width = line_bbox[2] - line_bbox[0]
         line_x = card_x + (card_width - line_width) // 2
 
         # Draw line with colored shadow
-        draw.text((line_x + 2, name_y + 2), line, fill=PRIMARY_COLOR, font=font_name)
-        draw.text((line_x, name_y), line, fill=TEXT_COLOR, font=font_name)
+        _draw_text_with_shadow(
+            final_img, (line_x, name_y), line, font_name, line_bbox, PRIMARY_COLOR
+        )
 
         # Move to next line position
         name_y += line_height + LINE_SPACING
@@ -189,34 +239,29 @@ def generate_qr_code_base64(code: str, name: str) -> str:
         fill=QR_BACKGROUND,
     )
 
-    # Create mask for rounded QR code
-    mask = Image.new('L', (qr_width, qr_height), 0)
-    mask_draw = ImageDraw.Draw(mask)
-    mask_draw.rounded_rectangle([(0, 0), (qr_width, qr_height)], radius=12, fill=255)
-
-    # Paste QR code
-    qr_temp = Image.new('RGB', (qr_width, qr_height), QR_BACKGROUND)
-    qr_temp.paste(qr_img, (0, 0))
-    final_img.paste(qr_temp, (qr_x, qr_y), mask)
+    # Paste QR code; its white quiet zone blends into the rounded backdrop,
+    # so the corners don't need their own mask
+    final_img.paste(qr_img, (qr_x, qr_y))
 
     # Calculate text position
     text_y = qr_y + qr_height + TEXT_MARGIN
 
     # Draw "ATTENDEE CODE" label
     label_text = 'ATTENDEE CODE'
-    label_bbox = draw.textbbox((0, 0), label_text, font=font_small)
+    label_bbox = text_bbox(label_text, font_small)
     label_width = label_bbox[2] - label_bbox[0]
     label_x = card_x + (card_width - label_width) // 2
     draw.text((label_x, text_y - 25), label_text, fill='#94A3B8', font=font_small)
 
     # Draw the code with gradient-like color
-    code_bbox = draw.textbbox((0, 0), code, font=font_large)
+    code_bbox = text_bbox(code, font_large)
     code_width = code_bbox[2] - code_bbox[0]
     code_x = card_x + (card_width - code_width) // 2
 
     # Draw text with colored shadow for depth
-    draw.text((code_x + 2, text_y + 2), code, fill=PRIMARY_COLOR, font=font_large)
-    draw.text((code_x, text_y), code, fill=TEXT_COLOR, font=font_large)
+    _draw_text_with_shadow(
+        final_img, (code_x, text_y), code, font_large, code_bbox, PRIMARY_COLOR
+    )
 
     # Add small decorative accent dots
     dot_y = card_y + card_height - 15
@@ -247,9 +292,11 @@ def generate_qr_code_base64(code: str, name: str) -> str:
     return base64_str
 
 
+@lru_cache(maxsize=1024)
 def generate_plain_qr_code_base64(code: str) -> str:
     """
     Generate a plain black and white QR code image and return it as a base64-encoded PNG.
+    The output only depends on the code, so recent results are cached.
 
     Args:
         code: The attendee code (e.g., "EP25NJAH")
@@ -260,18 +307,11 @@ def generate_plain_qr_code_base64(code: str) -> str:
     # Create the JSON content for the QR code (same format as styled version)
     qr_content = json.dumps({'code': code})
 
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
+    # Generate QR code, smallest version that fits
+    qr = segno.make_qr(qr_content, error='h')
 
     # Create the plain QR code image (black and white only)
-    qr_img = qr.make_image(fill_color='black', back_color='white')
+    qr_img = _render_qr(qr, box_size=10, border=4)
 
     # Convert to base64
     buffered = BytesIO()
@@ -282,42 +322,58 @@ def generate_plain_qr_code_base64(code: str) -> str:
     return base64_str
 
 
-def _hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+def _render_qr(qr, box_size, border):
+    """
+    Render the QR module matrix as a black and white image.
 
+    Builds a one-pixel-per-module image, including the quiet zone, and
+    upscales it with nearest-neighbour resampling.
+    """
+    size = qr.symbol_size(scale=1, border=border)[0]
+    img = Image.new('1', (size, size))
+    img.putdata(
+        [0 if module else 1 for row in qr.matrix_iter(border=border) for module in row]
+    )
+    return img.resize((size * box_size, size * box_size), Image.NEAREST)
 
-def _wrap_text(text, font, max_width, draw):
+
+def _wrap_text(text, font, max_width):
     """
     Wrap text to fit within a maximum width, breaking at word boundaries.
+    Each word is measured once and line widths are accumulated, ignoring
+    kerning across the joining space.
 
     Args:
         text: The text to wrap
         font: The font to use for measuring
         max_width: Maximum width in pixels
-        draw: ImageDraw object for measuring text
 
     Returns:
         List of lines
     """
     words = text.split()
+    space_width = font.getlength(' ')
     lines = []
     current_line = []
+    current_width = 0
 
     for word in words:
         # Try adding the word to the current line
-        test_line = ' '.join(current_line + [word])
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        width = bbox[2] - bbox[0]
+        word_width = font.getlength(word)
+        if current_line:
+            width = current_width + space_width + word_width
+        else:
+            width = word_width
 
         if width <= max_width:
             current_line.append(word)
+            current_width = width
         else:
             # Current line is full, start a new one
             if current_line:
                 lines.append(' '.join(current_line))
                 current_line = [word]
+                current_width = word_width
             else:
                 # Single word is too long, add it anyway
                 lines.append(word)
@@ -1,136 +1,167 @@
 import time
 from datetime import timedelta
+from functools import lru_cache
 from typing import List
 
-from sqlalchemy import select, true
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select, true
+from sqlalchemy.orm import Session, selectinload
 
+from app.api.email_logs.crud import EMAIL_LOG_BATCH_SIZE
 from app.api.email_logs.crud import email_log as email_log_crud
-from app.api.email_logs.schemas import EmailEvent
+from app.api.email_logs.schemas import EmailEvent, EmailLogCreate
 from app.core import models
 from app.core.database import SessionLocal
 from app.core.logger import logger
 from app.core.utils import current_time
 
+POPUP_CITY_ID = 2
 
+
+@lru_cache(maxsize=1024)
 def _format_price(price):
     return f'${price:,.2f}'.rstrip('0').rstrip('.')
 
 
-def get_to_exclude_emails(db: Session) -> List[str]:
-    """Get list of emails that have received an abandoned cart email in the past week.
+def _abandoned_cart_email_sent():
+    """Whether the application's email got an abandoned cart email in the past week.
 
-    These emails should be excluded from receiving another abandoned cart email
-    to avoid spamming users.
+    These applications are excluded from receiving another abandoned cart email
+    to avoid spamming users. Correlated as NOT EXISTS, so the check runs in the
+    database instead of binding every recent recipient into the query.
     """
     one_week_ago = current_time() - timedelta(days=7)
-    return db.scalars(
-        select(models.EmailLog.receiver_email).where(
-            models.EmailLog.event == EmailEvent.ABANDONED_CART.value,
-            models.EmailLog.created_at >= one_week_ago,
-        )
-    ).all()
+    return exists().where(
+        models.EmailLog.receiver_email == models.Application.email,
+        models.EmailLog.event == EmailEvent.ABANDONED_CART.value,
+        models.EmailLog.created_at >= one_week_ago,
+    )
 
 
-def process_abandoned_cart(db: Session, to_exclude_emails: List[str]):
+def process_abandoned_cart(db: Session):
     five_hours_ago = current_time() - timedelta(hours=5)
     one_hours_ago = current_time() - timedelta(hours=1)
-    # Subquery: latest payment OVERALL per application in popup_city_id=2
-    latest_per_app = (
+    # Lateral subquery: latest payment OVERALL for each application, so Postgres
+    # fetches a single row per application from ix_payments_application_latest
+    latest_payment = (
         select(
-            models.Payment.application_id,
+            models.Payment.id,
             models.Payment.status,
             models.Payment.created_at,
-            models.Payment.id,
-        )
-        .join(
-            models.Application,
-            models.Application.id == models.Payment.application_id,
         )
         .where(
-            models.Application.popup_city_id == 2,
-            models.Application.email.notin_(to_exclude_emails)
-            if to_exclude_emails
-            else true(),
+            models.Payment.application_id == models.Application.id,
             models.Payment.edit_passes.is_(False),
         )
-        .distinct(models.Payment.application_id)  # DISTINCT ON (application_id)
         .order_by(
-            models.Payment.application_id,
             models.Payment.created_at.desc().nulls_last(),
             models.Payment.id.desc(),
         )
-    ).subquery('latest_per_app')
+        .limit(1)
+        .correlate(models.Application)
+    ).lateral('latest_payment')
 
     # Return the actual Payment rows that are those "latest" rows
     stmt = (
         select(models.Payment)
-        .join(latest_per_app, models.Payment.id == latest_per_app.c.id)
+        .select_from(models.Application)
+        .join(latest_payment, true())
+        .join(models.Payment, models.Payment.id == latest_payment.c.id)
         .where(
-            latest_per_app.c.status != 'approved',
-            latest_per_app.c.created_at >= five_hours_ago,
-            latest_per_app.c.created_at <= one_hours_ago,
+            models.Application.popup_city_id == POPUP_CITY_ID,
+            ~_abandoned_cart_email_sent(),
+            latest_payment.c.status != 'approved',
+            latest_payment.c.created_at >= five_hours_ago,
+            latest_payment.c.created_at <= one_hours_ago,
+        )
+        # Load everything the email needs up front instead of lazily per payment
+        # (popup_city is joined-loaded with the application)
+        .options(
+            selectinload(models.Payment.application),
+            selectinload(models.Payment.products_snapshot).selectinload(
+                models.PaymentProduct.attendee
+            ),
         )
     )
 
     payments = db.scalars(stmt).all()
     logger.info('Found %s payments', len(payments))
-    for p in payments:
-        logger.info('Processing payment %s %s', p.id, p.application.email)
-
-        lines = []
-        total = 0
-        for ps in p.products_snapshot:
-            lines.extend(
-                [
-                    f'<strong>Name:</strong> {ps.attendee.name}',
-                    f'<strong>Ticket:</strong> {ps.product_name}',
-                ]
-            )
-            if p.discount_value:
-                amount = round(ps.product_price * (1 - p.discount_value / 100), 2)
-            else:
-                amount = ps.product_price
-
-            total += amount
-            lines.append(f'<strong>Price:</strong> {_format_price(amount)}<br>')
-
-        assert p.amount == total
-        if len(p.products_snapshot) > 1:
-            lines.append(f'<strong>Total:</strong> {_format_price(p.amount)}')
-
-        purchase_details = '<br>'.join(lines)
-        logger.info('Purchase details: %s', purchase_details)
-
-        params = {
-            'first_name': p.application.first_name,
-            'purchase_details': purchase_details,
-            'ticketing_url': p.checkout_url,
-        }
-
-        email_log_crud.send_mail(
-            receiver_mail=p.application.email,
-            event=EmailEvent.ABANDONED_CART.value,
-            popup_city=p.application.popup_city,
-            params=params,
-            entity_type='payment',
-            entity_id=p.id,
-            citizen_id=p.application.citizen_id,
-            popup_slug=p.application.popup_city.slug,
+    # Every payment belongs to the same popup, so share one instance for all emails
+    popup_city = db.get(
+        models.PopUpCity,
+        POPUP_CITY_ID,
+        options=[selectinload(models.PopUpCity.templates)],
+    )
+    pending_logs: List[EmailLogCreate] = []
+    try:
+        for p in payments:
+            _send_abandoned_cart_email(p, popup_city, pending_logs)
+            # Logs mark the email as sent, so write them as we go
+            if len(pending_logs) >= EMAIL_LOG_BATCH_SIZE:
+                email_log_crud.create_logs(db, pending_logs)
+    finally:
+        email_log_crud.create_logs(db, pending_logs)
+
+
+def _send_abandoned_cart_email(
+    p: models.Payment,
+    popup_city: models.PopUpCity,
+    pending_logs: List[EmailLogCreate],
+) -> None:
+    snapshot = p.products_snapshot
+    if p.discount_value:
+        factor = 1 - p.discount_value / 100
+        amounts = [round(ps.product_price * factor, 2) for ps in snapshot]
+    else:
+        amounts = [ps.product_price for ps in snapshot]
+
+    lines = [
+        line
+        for ps, amount in zip(snapshot, amounts)
+        for line in (
+            f'<strong>Name:</strong> {ps.attendee.name}',
+            f'<strong>Ticket:</strong> {ps.product_name}',
+            f'<strong>Price:</strong> {_format_price(amount)}<br>',
         )
-
-        logger.info('-' * 100)
+    ]
+
+    assert p.amount == sum(amounts)
+    if len(snapshot) > 1:
+        lines.append(f'<strong>Total:</strong> {_format_price(p.amount)}')
+
+    purchase_details = '<br>'.join(lines)
+
+    params = {
+        'first_name': p.application.first_name,
+        'purchase_details': purchase_details,
+        'ticketing_url': p.checkout_url,
+    }
+
+    email_log_crud.send_mail(
+        receiver_mail=p.application.email,
+        event=EmailEvent.ABANDONED_CART.value,
+        popup_city=popup_city,
+        params=params,
+        entity_type='payment',
+        entity_id=p.id,
+        citizen_id=p.application.citizen_id,
+        popup_slug=popup_city.slug,
+        pending_logs=pending_logs,
+    )
+    logger.info(
+        'Abandoned cart email for payment %s %s: %s products, total %s',
+        p.id,
+        p.application.email,
+        len(snapshot),
+        p.amount,
+    )
 
 
 def main():
     with SessionLocal() as db:
-        to_exclude = get_to_exclude_emails(db)
-        logger.info('To exclude emails: %s', to_exclude)
-        process_abandoned_cart(db, to_exclude)
-
-    logger.info('Sleeping for 2 minutes...')
-    time.sleep(120)
+        process_abandoned_cart(db)
 
 
 if __name__ == '__main__':
     main()
+    logger.info('Sleeping for 2 minutes...')
+    time.sleep(120)
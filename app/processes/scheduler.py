@@ -0,0 +1,53 @@
+import random
+import threading
+import time
+from typing import Callable
+
+from app.core.logger import logger
+from app.processes import abandoned_cart, auto_approval, send_scheduled_emails
+
+# (job, seconds to wait after a run finishes before starting the next one).
+# Only the short, frequent jobs live here; the slow mailers (reminders and
+# pre-arrival) keep their own processes so a long run never delays these.
+JOBS = [
+    (send_scheduled_emails.send_scheduled_emails, 30),
+    (auto_approval.main, 60),
+    (abandoned_cart.main, 2 * 60),
+]
+
+# Up to this fraction of the interval is added to each wait so jobs drift apart
+JITTER = 0.1
+
+
+def run_job_forever(job: Callable[[], None], interval: int):
+    """Run `job` in its own thread: a failing or slow job only affects itself,
+    and a run never overlaps with the previous one."""
+    name = f'{job.__module__}.{job.__name__}'
+    while True:
+        logger.info('Running job %s', name)
+        try:
+            job()
+        except Exception as e:
+            logger.exception('Error running job %s: %s', name, e)
+        time.sleep(interval + random.uniform(0, interval * JITTER))
+
+
+def main():
+    threads = [
+        threading.Thread(
+            target=run_job_forever,
+            args=(job, interval),
+            name=job.__module__,
+            daemon=True,
+        )
+        for job, interval in JOBS
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+if __name__ == '__main__':
+    logger.info('Starting scheduler with %s jobs', len(JOBS))
+    main()
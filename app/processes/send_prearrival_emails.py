@@ -1,16 +1,20 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import List
+from typing import Callable, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session, aliased, selectinload
 
 from app.api.applications.models import Application
 from app.api.attendees.models import Attendee
 from app.api.check_in.models import CheckIn
+from app.api.email_logs.crud import EMAIL_LOG_BATCH_SIZE
 from app.api.email_logs.crud import email_log as email_log_crud
 from app.api.email_logs.models import EmailLog
-from app.api.email_logs.schemas import EmailAttachment, EmailEvent
+from app.api.email_logs.schemas import EmailAttachment, EmailEvent, EmailLogCreate
 from app.api.popup_city.models import PopUpCity
+from app.api.products.models import Product
 from app.core import models  # noqa: F401
 from app.core.config import Environment, settings
 from app.core.database import SessionLocal
@@ -21,10 +25,13 @@ from app.core.utils import current_time
 POPUP_CITY_SLUG = 'edge-patagonia'
 DAYS_BEFORE_START_5DAY = 5
 DAYS_BEFORE_START_24H = 1
+MAX_CONCURRENT_SENDS = 8
+APPLICATIONS_BATCH_SIZE = 200
 
 
 def generate_qr_attachment(check_in_code: str, attendee_name: str):
-    """Generate a modern, styled QR code attachment for an attendee."""
+    """Build a modern, styled QR code attachment for an attendee."""
+    # generate_qr_code_base64 is lru_cached, so repeated codes render only once
     logger.info('Generating QR code for %s %s', check_in_code, attendee_name)
     filename = f'{attendee_name}.png'.replace(' ', '_')
     return EmailAttachment(
@@ -62,23 +69,24 @@ def generate_checkin_codes_html(attendees: List[Attendee]) -> str:
     return f"<p>Here are the access codes for your guests:</p><ul>{''.join(html_parts)}</ul><p>You'll find their QR codes attached.</p>"
 
 
-def get_earliest_start_date(application: Application):
+def _starts_by(target_date):
     """
-    Get the earliest start date from all products across all attendees.
-    Fallback to popup city start date if no product has a start date.
+    Whether the earliest start date across all the application's attendee
+    products is on or before target_date, falling back to the popup city start
+    date if no product has one. Evaluated in SQL, so applications that start
+    later are never loaded.
     """
-    earliest_date = None
-    for attendee in application.attendees:
-        for product in attendee.products:
-            if product.start_date:
-                if not earliest_date or product.start_date < earliest_date:
-                    earliest_date = product.start_date
-
-    if not earliest_date:
-        # Fallback to popup city start date
-        earliest_date = application.popup_city.start_date
-
-    return earliest_date
+    attendee = aliased(Attendee)
+    product = aliased(Product)
+    earliest_product_start = (
+        select(func.min(product.start_date))
+        .select_from(attendee)
+        .join(attendee.products.of_type(product))
+        .where(attendee.application_id == Application.id)
+        .correlate(Application)
+        .scalar_subquery()
+    )
+    return func.coalesce(earliest_product_start, PopUpCity.start_date) <= target_date
 
 
 def has_any_attendee_checked_in(application: Application, db: Session) -> bool:
@@ -104,14 +112,12 @@ def has_any_attendee_checked_in(application: Application, db: Session) -> bool:
     return checked_in_count > 0
 
 
-def get_sent_prearrival_emails(db: Session, event: str) -> List[str]:
-    """Get list of application emails that have already received pre-arrival emails for a specific event."""
-    logs = (
-        db.query(EmailLog.receiver_email.distinct())
-        .filter(EmailLog.event == event)
-        .all()
+def _prearrival_email_sent(event: str):
+    """Whether the application's email already got a pre-arrival email for event."""
+    return exists().where(
+        EmailLog.receiver_email == Application.email,
+        EmailLog.event == event,
     )
-    return [log[0] for log in logs]
 
 
 def get_applications_for_prearrival(db: Session):
@@ -122,15 +128,13 @@ def get_applications_for_prearrival(db: Session):
     - From Edge Patagonia (popup_city slug == 'edge-patagonia')
     - Has attendees with products
     - Earliest product start date is 5 days or less away
-    - Haven't received pre-arrival email yet (deduplication handled by exclusion list)
+    - Haven't received pre-arrival email yet (excluded in the query)
     """
-    excluded_emails = get_sent_prearrival_emails(db, EmailEvent.PRE_ARRIVAL.value)
-    logger.info('Excluded application emails: %s', excluded_emails)
-
     today = current_time()
     target_date = today + timedelta(days=DAYS_BEFORE_START_5DAY)
 
-    # Get all applications from Edge Patagonia with attendees that have products
+    # Get applications from Edge Patagonia with attendees that have products,
+    # whose earliest start date is 5 days or less away
     applications = (
         db.query(Application)
         .join(Application.popup_city)
@@ -138,41 +142,22 @@ def get_applications_for_prearrival(db: Session):
         .join(Attendee.products)
         .filter(
             PopUpCity.slug == POPUP_CITY_SLUG,
-            Application.email.notin_(excluded_emails),
+            ~_prearrival_email_sent(EmailEvent.PRE_ARRIVAL.value),
+            _starts_by(target_date),
+        )
+        .options(
+            selectinload(Application.attendees).selectinload(Attendee.products),
+            selectinload(Application.popup_city).selectinload(PopUpCity.templates),
         )
         .distinct()
         .all()
     )
 
-    logger.info('Applications before filter: %s', len(applications))
+    logger.info('Total applications found: %s', len(applications))
+    logger.info('Emails: %s', [a.email for a in applications])
+    logger.info('Applications ids to process: %s', [a.id for a in applications])
 
-    # Filter to only include applications where the earliest start date
-    # is 5 days or less away
-    filtered_applications = []
-    for application in applications:
-        earliest_date = get_earliest_start_date(application)
-        logger.info(
-            'Earliest date for application %s %s: %s',
-            application.id,
-            application.email,
-            earliest_date.strftime('%Y-%m-%d'),
-        )
-        if not earliest_date:
-            logger.error('No earliest date for application %s', application.id)
-            continue
-
-        # Check if earliest start date is at most 5 days away
-        if earliest_date <= target_date:
-            logger.info('Application %s is 5 days or less away', application.id)
-            filtered_applications.append(application)
-
-    logger.info('Total applications found: %s', len(filtered_applications))
-    logger.info('Emails: %s', [a.email for a in filtered_applications])
-    logger.info(
-        'Applications ids to process: %s', [a.id for a in filtered_applications]
-    )
-
-    return filtered_applications
+    return applications
 
 
 def get_applications_for_24h_prearrival(db: Session):
@@ -184,15 +169,13 @@ def get_applications_for_24h_prearrival(db: Session):
     - Has attendees with products
     - Earliest product start date is 1 day or less away
     - No attendees have checked in yet (qr_check_in=False)
-    - Haven't received 24-hour pre-arrival email yet (deduplication handled by exclusion list)
+    - Haven't received 24-hour pre-arrival email yet (excluded in the query)
     """
-    excluded_emails = get_sent_prearrival_emails(db, EmailEvent.PRE_ARRIVAL_24H.value)
-    logger.info('Excluded 24h application emails: %s', excluded_emails)
-
     today = current_time()
     target_date = today + timedelta(days=DAYS_BEFORE_START_24H)
 
-    # Get all applications from Edge Patagonia with attendees that have products
+    # Get applications from Edge Patagonia with attendees that have products,
+    # whose earliest start date is 1 day or less away
     applications = (
         db.query(Application)
         .join(Application.popup_city)
@@ -200,44 +183,35 @@ def get_applications_for_24h_prearrival(db: Session):
         .join(Attendee.products)
         .filter(
             PopUpCity.slug == POPUP_CITY_SLUG,
-            Application.email.notin_(excluded_emails),
+            ~_prearrival_email_sent(EmailEvent.PRE_ARRIVAL_24H.value),
+            _starts_by(target_date),
+        )
+        .options(
+            selectinload(Application.attendees).selectinload(Attendee.products),
+            selectinload(Application.popup_city).selectinload(PopUpCity.templates),
         )
         .distinct()
-        .all()
+        .yield_per(APPLICATIONS_BATCH_SIZE)
     )
 
-    logger.info('Applications before filter (24h): %s', len(applications))
-
-    # Filter to only include applications where the earliest start date
-    # is 1 day or less away
+    # Streamed in batches, so only the applications that pass are kept in memory
     filtered_applications = []
+    scanned = 0
     for application in applications:
-        earliest_date = get_earliest_start_date(application)
-        logger.info(
-            'Earliest date for application %s %s (24h check): %s',
-            application.id,
-            application.email,
-            earliest_date.strftime('%Y-%m-%d'),
-        )
-        if not earliest_date:
-            logger.error('No earliest date for application %s', application.id)
+        scanned += 1
+
+        # Check if any attendee has already checked in
+        if has_any_attendee_checked_in(application, db):
+            logger.info(
+                'Skipping application %s %s - at least one attendee has already checked in',
+                application.id,
+                application.email,
+            )
             continue
 
-        # Check if earliest start date is at most 1 day away
-        if earliest_date <= target_date:
-            logger.info('Application %s is 1 day or less away', application.id)
-
-            # Check if any attendee has already checked in
-            if has_any_attendee_checked_in(application, db):
-                logger.info(
-                    'Skipping application %s %s - at least one attendee has already checked in',
-                    application.id,
-                    application.email,
-                )
-                continue
-
-            filtered_applications.append(application)
+        filtered_applications.append(application)
 
+    logger.info('Applications starting within 24h: %s', scanned)
     logger.info('Total 24h applications found: %s', len(filtered_applications))
     logger.info('24h Emails: %s', [a.email for a in filtered_applications])
     logger.info(
@@ -247,7 +221,10 @@ def get_applications_for_24h_prearrival(db: Session):
     return filtered_applications
 
 
-def process_application_for_prearrival(application: Application):
+def process_application_for_prearrival(
+    application: Application,
+    pending_logs: List[EmailLogCreate],
+):
     """Send pre-arrival email to application with QR codes for all attendees."""
     logger.info('Processing application %s %s', application.id, application.email)
 
@@ -263,10 +240,14 @@ def process_application_for_prearrival(application: Application):
         entity_type='application',
         entity_id=application.id,
         attachments=attachments,
+        pending_logs=pending_logs,
     )
 
 
-def process_application_for_24h_prearrival(application: Application):
+def process_application_for_24h_prearrival(
+    application: Application,
+    pending_logs: List[EmailLogCreate],
+):
     """Send 24-hour pre-arrival email to application with check-in codes details and QR codes."""
     logger.info('Processing 24h application %s %s', application.id, application.email)
 
@@ -307,9 +288,43 @@ def process_application_for_24h_prearrival(application: Application):
         entity_type='application',
         entity_id=application.id,
         attachments=attachments,
+        pending_logs=pending_logs,
     )
 
 
+def send_emails_concurrently(
+    db: Session,
+    applications: List[Application],
+    process: Callable[..., None],
+    label: str,
+):
+    """
+    Send the emails for several applications at once, so the Postmark round
+    trips overlap instead of running back to back. The email logs are written
+    after every batch of applications, since they mark the emails as sent.
+
+    The workers only read already-loaded attributes (the queries above load the
+    popup templates up front), since the session is not thread-safe.
+    """
+
+    def process_one(application: Application):
+        try:
+            process(application, pending_logs)
+        except Exception as e:
+            logger.error(
+                'Error processing %s application %s: %s', label, application.id, str(e)
+            )
+
+    pending_logs: List[EmailLogCreate] = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SENDS) as executor:
+        for i in range(0, len(applications), EMAIL_LOG_BATCH_SIZE):
+            try:
+                batch = applications[i : i + EMAIL_LOG_BATCH_SIZE]
+                list(executor.map(process_one, batch))
+            finally:
+                email_log_crud.create_logs(db, pending_logs)
+
+
 def send_prearrival_emails(db: Session):
     """Main function to process and send pre-arrival emails (both 5-day and 24-hour)."""
     logger.info('Starting pre-arrival email process')
@@ -319,28 +334,18 @@ def send_prearrival_emails(db: Session):
     applications_5day = get_applications_for_prearrival(db)
     logger.info('Total 5-day applications to process: %s', len(applications_5day))
 
-    for application in applications_5day:
-        try:
-            process_application_for_prearrival(application)
-        except Exception as e:
-            logger.error(
-                'Error processing 5-day application %s: %s', application.id, str(e)
-            )
-            continue
+    send_emails_concurrently(
+        db, applications_5day, process_application_for_prearrival, '5-day'
+    )
 
     # Process 24-hour pre-arrival emails
     logger.info('Processing 24-hour pre-arrival emails')
     applications_24h = get_applications_for_24h_prearrival(db)
     logger.info('Total 24-hour applications to process: %s', len(applications_24h))
 
-    for application in applications_24h:
-        try:
-            process_application_for_24h_prearrival(application)
-        except Exception as e:
-            logger.error(
-                'Error processing 24h application %s: %s', application.id, str(e)
-            )
-            continue
+    send_emails_concurrently(
+        db, applications_24h, process_application_for_24h_prearrival, '24h'
+    )
 
     logger.info('Finished pre-arrival email process')
 
@@ -2,17 +2,21 @@ import json
 import time
 from datetime import datetime, timedelta
 from enum import Enum
+from typing import List, Set
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from app.api.applications.crud import application as application_crud
 from app.api.applications.models import Application
 from app.api.applications.schemas import ApplicationFilter, ApplicationStatus
+from app.api.email_logs.crud import EMAIL_LOG_BATCH_SIZE
 from app.api.email_logs.crud import email_log as email_log_crud
 from app.api.email_logs.models import EmailLog
-from app.api.email_logs.schemas import EmailStatus
+from app.api.email_logs.schemas import EmailLogCreate, EmailStatus
+from app.api.payments.models import Payment
 from app.api.popup_city.crud import popup_city as popup_city_crud
-from app.api.popup_city.models import EmailTemplate
+from app.api.popup_city.models import EmailTemplate, PopUpCity
 from app.core.config import settings
 from app.core.database import SessionLocal
 from app.core.logger import logger
@@ -28,6 +32,7 @@ def _send_reminder_email(
     application: Application,
     email_template: EmailTemplate,
     freq: str,
+    pending_logs: List[EmailLogCreate],
 ):
     params = {
         'first_name': application.first_name,
@@ -45,6 +50,7 @@ def _send_reminder_email(
         spice=application.citizen.spice,
         citizen_id=application.citizen_id,
         popup_slug=application.popup_city.slug,
+        pending_logs=pending_logs,
     )
 
 
@@ -64,11 +70,13 @@ def process_application_reminders(
     db: Session,
     application: Application,
     email_template: EmailTemplate,
+    pending_logs: List[EmailLogCreate],
+    paid_application_ids: Set[int],
 ) -> None:
     used_frequencies = get_used_frequencies(db, application.id, email_template.template)
     from_date = get_reminder_start_date(application, email_template.event)
     if email_template.event == ReminderEvent.PURCHASE_REMINDER:
-        if any(payment.status == 'approved' for payment in application.payments):
+        if application.id in paid_application_ids:
             logger.info('Application %s has a paid payment', application.id)
             return
 
@@ -84,7 +92,21 @@ def process_application_reminders(
             continue
 
         if is_reminder_due(from_date, freq_delta):
-            _send_reminder_email(application, email_template, frequency)
+            _send_reminder_email(application, email_template, frequency, pending_logs)
+
+
+def get_paid_application_ids(db: Session, application_ids: List[int]) -> Set[int]:
+    """Get the ids of the given applications that have an approved payment."""
+    rows = (
+        db.query(Payment.application_id)
+        .filter(
+            Payment.application_id.in_(application_ids),
+            Payment.status == 'approved',
+        )
+        .distinct()
+        .all()
+    )
+    return {application_id for (application_id,) in rows}
 
 
 def get_used_frequencies(
@@ -142,24 +164,48 @@ def is_reminder_due(from_date: datetime, frequency: timedelta) -> bool:
 
 
 def send_reminder_email(db: Session, email_template: EmailTemplate):
-    popup_city_id = email_template.popup_city_id
+    # Load the popup with its templates once and keep a reference to it: the
+    # identity map is weak, and every application shares this instance
+    popup_city = db.scalars(
+        select(PopUpCity)
+        .where(PopUpCity.id == email_template.popup_city_id)
+        .options(selectinload(PopUpCity.templates))
+    ).one()
     skip = 0
     limit = 1000
     while True:
         applications = application_crud.find(
             db,
             filters=ApplicationFilter(
-                popup_city_id=popup_city_id,
+                popup_city_id=popup_city.id,
                 status=get_application_status(email_template.event),
             ),
             skip=skip,
             limit=limit,
         )
         logger.info(
-            f'Found {len(applications)} applications for popup city {popup_city_id}'
+            f'Found {len(applications)} applications for popup city {popup_city.id}'
         )
-        for application in applications:
-            process_application_reminders(db, application, email_template)
+        paid_application_ids = set()
+        if applications and email_template.event == ReminderEvent.PURCHASE_REMINDER:
+            paid_application_ids = get_paid_application_ids(
+                db, [application.id for application in applications]
+            )
+        pending_logs: List[EmailLogCreate] = []
+        try:
+            for application in applications:
+                process_application_reminders(
+                    db,
+                    application,
+                    email_template,
+                    pending_logs,
+                    paid_application_ids,
+                )
+                # Logs mark the reminder as sent, so write them as we go
+                if len(pending_logs) >= EMAIL_LOG_BATCH_SIZE:
+                    email_log_crud.create_logs(db, pending_logs)
+        finally:
+            email_log_crud.create_logs(db, pending_logs)
         skip += limit
         if len(applications) < limit:
             break
@@ -1,5 +1,7 @@
 from contextlib import asynccontextmanager
+from importlib import metadata
 
+import PIL
 import uvicorn
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -20,12 +22,19 @@ from app.api.webhooks.routes import router as webhooks_router
 from app.api.world_builders.routes import router as world_builders_router
 from app.core.config import Environment, settings
 from app.core.database import create_db
+from app.core.logger import logger
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     if settings.ENVIRONMENT != Environment.TEST:
         create_db()
+    # Pillow-SIMD installs under its own distribution name (see the Dockerfile)
+    try:
+        pillow_simd = metadata.version('pillow-simd')
+    except metadata.PackageNotFoundError:
+        pillow_simd = 'not installed'
+    logger.info('Pillow %s (Pillow-SIMD: %s)', PIL.__version__, pillow_simd)
     yield
 
 
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from app.api.email_logs.crud import email_log as email_log_crud
+from app.api.email_logs.models import EmailLog
+from app.api.email_logs.schemas import EmailLogCreate, EmailStatus
+
+
+def _pending_logs(count: int) -> list:
+    return [
+        EmailLogCreate(
+            receiver_email=f'test{i}@example.com',
+            template='test-template',
+            event='test-event',
+            params={},
+            status=EmailStatus.SUCCESS,
+        )
+        for i in range(count)
+    ]
+
+
+def test_create_logs_commits_every_batch(db_session, test_citizen):
+    pending_logs = _pending_logs(5)
+
+    email_log_crud.create_logs(db_session, pending_logs, batch_size=2)
+
+    assert pending_logs == []
+    logs = db_session.query(EmailLog).order_by(EmailLog.receiver_email).all()
+    assert [log.receiver_email for log in logs] == [
+        f'test{i}@example.com' for i in range(5)
+    ]
+    assert logs[1].citizen_id == test_citizen.id
+
+
+def test_create_logs_falls_back_to_single_inserts(db_session):
+    pending_logs = _pending_logs(3)
+
+    with patch.object(
+        email_log_crud, '_insert_logs', side_effect=Exception('batch failed')
+    ):
+        email_log_crud.create_logs(db_session, pending_logs)
+
+    assert pending_logs == []
+    assert db_session.query(EmailLog).count() == 3
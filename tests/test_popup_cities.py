@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from fastapi import status
+
+from app.api.popup_city.models import PopUpCity
+
+
+def test_get_popup_cities(client, auth_headers, db_session):
+    db_session.add_all(
+        [
+            PopUpCity(
+                id=1,
+                name='Test City',
+                slug='test-city',
+                prefix='TC',
+                location='Test Location',
+                start_date=datetime(2025, 5, 1, 10, 30),
+                portal_order=2,
+            ),
+            PopUpCity(id=2, name='Other City', slug='other-city', prefix='OC'),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get('/popups', headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [popup['id'] for popup in data] == [2, 1]
+    assert set(data[1]) == {
+        'id',
+        'name',
+        'slug',
+        'tagline',
+        'location',
+        'passes_description',
+        'image_url',
+        'express_checkout_background',
+        'ticketing_banner_description',
+        'start_date',
+        'end_date',
+        'clickable_in_portal',
+        'visible_in_portal',
+        'requires_approval',
+        'allows_spouse',
+        'allows_children',
+        'allows_coupons',
+        'created_at',
+        'updated_at',
+    }
+    assert data[1]['name'] == 'Test City'
+    assert data[1]['location'] == 'Test Location'
+    assert data[1]['start_date'] == '2025-05-01T10:30:00'
+    assert data[1]['end_date'] is None
@@ -0,0 +1,26 @@
+import base64
+import json
+from io import BytesIO
+
+import segno
+from PIL import Image
+
+from app.core.qr_generator import generate_plain_qr_code_base64
+
+CHECK_IN_CODE = 'EP25NJAH'
+# Version qrcode picked for this content before the switch to segno
+QRCODE_VERSION = 3
+
+
+def test_qr_version_matches_qrcode():
+    content = json.dumps({'code': CHECK_IN_CODE})
+
+    assert segno.make_qr(content, error='h').version == QRCODE_VERSION
+
+
+def test_plain_qr_code_keeps_its_size():
+    png = base64.b64decode(generate_plain_qr_code_base64(CHECK_IN_CODE))
+
+    # (modules + 4-module border on each side) * 10px boxes
+    size = (QRCODE_VERSION * 4 + 17 + 2 * 4) * 10
+    assert Image.open(BytesIO(png)).size == (size, size)
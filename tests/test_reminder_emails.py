@@ -0,0 +1,58 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app.api.applications.models import Application
+from app.api.applications.schemas import ApplicationStatus
+from app.api.email_logs.models import EmailLog
+from app.api.email_logs.schemas import EmailStatus
+from app.api.popup_city.models import EmailTemplate, PopUpCity
+from app.core.database import raise_on_lazy_load
+from app.core.utils import current_time
+from app.processes.send_reminder_emails import ReminderEvent, send_reminder_email
+
+
+@pytest.fixture
+def reminder_template_id(db_session, test_citizen):
+    popup = PopUpCity(id=1, name='Test City', slug='test-city', prefix='TC')
+    template = EmailTemplate(
+        popup_city_id=popup.id,
+        event=ReminderEvent.PURCHASE_REMINDER.value,
+        template='purchase-reminder-template',
+        frequency='1h',
+    )
+    application = Application(
+        first_name='Test',
+        last_name='User',
+        email=test_citizen.primary_email,
+        citizen_id=test_citizen.id,
+        popup_city_id=popup.id,
+        _status=ApplicationStatus.ACCEPTED.value,
+        accepted_at=current_time() - timedelta(minutes=90),
+    )
+    db_session.add_all([popup, template, application])
+    db_session.commit()
+    return template.id
+
+
+def test_send_reminder_email_without_lazy_loads(db_session, reminder_template_id):
+    # Start from a clean session, as the process does, and fail on any lazy load
+    db_session.expunge_all()
+    event.listen(db_session, 'do_orm_execute', raise_on_lazy_load)
+    try:
+        with patch(
+            'app.api.email_logs.crud.send_mail',
+            return_value={'status': EmailStatus.SUCCESS},
+        ) as mock_send_mail:
+            template = db_session.get(EmailTemplate, reminder_template_id)
+            send_reminder_email(db_session, template)
+    finally:
+        event.remove(db_session, 'do_orm_execute', raise_on_lazy_load)
+
+    mock_send_mail.assert_called_once()
+    assert mock_send_mail.call_args.kwargs['template'] == 'purchase-reminder-template'
+    log = db_session.query(EmailLog).one()
+    assert log.status == EmailStatus.SUCCESS
+    assert log.event == ReminderEvent.PURCHASE_REMINDER.value